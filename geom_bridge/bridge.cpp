@@ -25,6 +25,16 @@ struct GeometryResult {
     std::vector<int>    flags;
 };
 
+// Hand a result vector to NumPy without copying: the vector is moved to the
+// heap and a capsule owned by the returned array deletes it, so Python owns
+// the buffer outright and C++ never touches it again
+template <typename T>
+static py::array_t<T> vector_to_array(std::vector<T>&& v) {
+    auto* owned = new std::vector<T>(std::move(v));
+    py::capsule base(owned, [](void* p) { delete static_cast<std::vector<T>*>(p); });
+    return py::array_t<T>(static_cast<ssize_t>(owned->size()), owned->data(), base);
+}
+
 // Core computation: Takes OWNED std::vectors, returns result
 // This runs with GIL released - no Python interaction during Geogram calls
 static GeometryResult compute_power_cells_periodic_vec(
@@ -149,23 +159,12 @@ PYBIND11_MODULE(geom_bridge, m) {
         }
         // GIL reacquired here automatically
 
-        // STEP 3: Return NEW NumPy arrays (owned copies, not views)
-        // This ensures Python owns its own memory, separate from std::vector
-        py::array_t<double> V_out(gr.volume.size());
-        std::memcpy(V_out.mutable_data(), gr.volume.data(),
-                    gr.volume.size() * sizeof(double));
-
-        py::array_t<double> A_out(gr.area.size());
-        std::memcpy(A_out.mutable_data(), gr.area.data(),
-                    gr.area.size() * sizeof(double));
-
-        py::array_t<int> FSC_out(gr.fsc.size());
-        std::memcpy(FSC_out.mutable_data(), gr.fsc.data(),
-                    gr.fsc.size() * sizeof(int));
-
-        py::array_t<int> FL_out(gr.flags.size());
-        std::memcpy(FL_out.mutable_data(), gr.flags.data(),
-                    gr.flags.size() * sizeof(int));
+        // STEP 3: Return NumPy arrays that take over the result buffers
+        // (zero-copy; each array owns its memory via a capsule, no aliasing)
+        py::array_t<double> V_out = vector_to_array(std::move(gr.volume));
+        py::array_t<double> A_out = vector_to_array(std::move(gr.area));
+        py::array_t<int> FSC_out = vector_to_array(std::move(gr.fsc));
+        py::array_t<int> FL_out = vector_to_array(std::move(gr.flags));
 
         // Return as tuple: (volume, area, fsc, flags)
         return py::make_tuple(V_out, A_out, FSC_out, FL_out);
@@ -188,7 +187,7 @@ PYBIND11_MODULE(geom_bridge, m) {
         Implementation:
             - Uses owned std::vector copies (no NumPy views)
             - Releases GIL during Geogram computation
-            - Returns fresh NumPy arrays (no memory aliasing)
+            - Returns NumPy arrays that own the result buffers (no copy, no aliasing)
             - SmartPointer<PeriodicDelaunay3d> per Bruno's guidance
     )doc");
 }
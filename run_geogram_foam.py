@@ -4,11 +4,15 @@ Geogram-Tailed Foam Viewer
 Live IQ-driven foam simulator with GGUI visualization
 """
 
-import os, time, numpy as np, sys, json
+import os, time, math, sys, json
 
 # PERFORMANCE: Disable debug tools for production runs
 os.environ.pop("PYTHONMALLOC", None)  # Remove debug malloc if set
-os.environ.setdefault("OMP_NUM_THREADS", "1")
+# Pin BLAS/OpenMP pools before numpy loads them (one geometry call in flight)
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import numpy as np
 
 import taichi as ti
 ti.init(arch=ti.gpu, kernel_profiler=False)
@@ -32,11 +36,16 @@ DEFAULT_SETTINGS = {
     "IQ_max": 0.85,
     "beta_grow": 1.5,  # Increased from 1.0 for more dramatic size changes
     "beta_shrink": 1.2,  # Increased from 0.7 for more dramatic size changes
+    "sim_fps": 60,  # Fixed RELAX step rate, independent of render FPS
+    "max_fps": 0,  # Render cap while running (0 = uncapped); paused/idle always throttle
 }
 
 # Memory safety check
 MAX_SAFE_N = 10000  # Hard limit to prevent system crashes
 
+# Keys polled for camera zoom (Q/E) and pan (WASD)
+CAMERA_KEYS = ('q', 'e', 'w', 'a', 's', 'd')
+
 def load_settings():
     """Load settings from JSON file, or return defaults"""
     if os.path.exists(CONFIG_FILE):
@@ -50,10 +59,12 @@ def load_settings():
     return DEFAULT_SETTINGS.copy()
 
 def save_settings(settings):
-    """Save settings to JSON file"""
+    """Save settings to JSON file (atomic: write temp file, then os.replace)"""
+    tmp = CONFIG_FILE + ".tmp"
     try:
-        with open(CONFIG_FILE, 'w') as f:
+        with open(tmp, 'w') as f:
             json.dump(settings, f, indent=2)
+        os.replace(tmp, CONFIG_FILE)  # Never leaves a half-written settings file
         print(f"✓ Saved settings to {CONFIG_FILE}")
     except Exception as e:
         print(f"⚠ Failed to save {CONFIG_FILE}: {e}")
@@ -68,91 +79,149 @@ def jittered_grid_positions01(n, seed=0):
     Create N positions in [0,1]³ using jittered grid.
     Avoids random overlaps that cause Geogram degeneracies.
     """
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     # Cube root rounding
     m = int(round(n ** (1/3)))
     m = max(4, m)
+    n_grid = m ** 3
     gx = np.linspace(0.05, 0.95, m)
-    pts = np.stack(np.meshgrid(gx, gx, gx, indexing='ij'), axis=-1).reshape(-1, 3)
     
-    if len(pts) < n:
+    # One buffer, grid written by broadcasting into an (m, m, m, 3) view
+    # (no meshgrid/stack temporaries, no concatenate)
+    buf = np.empty((max(n, n_grid), 3), np.float64)
+    grid = buf[:n_grid].reshape(m, m, m, 3)
+    grid[..., 0] = gx[:, None, None]
+    grid[..., 1] = gx[None, :, None]
+    grid[..., 2] = gx[None, None, :]
+    pts = buf[:n]
+    
+    if n_grid < n:
         # Pad with small jittered repeats
-        k = n - len(pts)
-        jitter = (np.random.rand(k, 3) - 0.5) * (1.0/m) * 0.2
-        pts = np.concatenate([pts, pts[:k] + jitter], axis=0)
+        k = n - n_grid
+        h = 0.5 * (1.0/m) * 0.2
+        pts[n_grid:] = pts[:k]
+        pts[n_grid:] += rng.uniform(-h, h, (k, 3))
     
-    pts = pts[:n]
     # Small jitter everywhere
-    pts += (np.random.rand(n, 3) - 0.5) * (1.0/m) * 0.1
-    return np.mod(pts, 1.0)
+    h = 0.5 * (1.0/m) * 0.1
+    pts += rng.uniform(-h, h, (n, 3))
+    # No wrap needed: grid spans [0.05, 0.95] and total jitter is ≤ 0.15/m ≤ 0.0375
+    return pts
 
 
 # ============================================================================
 # Minimal Taichi Sim (swap with your real one!)
 # ============================================================================
 
+@ti.func
+def hash_noise(a, b):
+    """
+    Cheap deterministic noise from two f32 coordinates, uniform in ±sqrt(1.5).
+    Integer bit-mix (lowbias32) on the raw float bits — ALU only, no sin().
+    Scaled so its RMS (1/sqrt(2)) matches the old sin() noise DIFFUSION was tuned for.
+    """
+    h = ti.bit_cast(a, ti.u32) ^ (ti.bit_cast(b, ti.u32) * ti.u32(0x9E3779B9))
+    h ^= ti.bit_shr(h, 16)
+    h *= ti.u32(0x7FEB352D)
+    h ^= ti.bit_shr(h, 15)
+    h *= ti.u32(0x846CA68B)
+    h ^= ti.bit_shr(h, 16)
+    return ti.cast(h, ti.f32) * (1.2247449 / 2147483648.0) - 1.2247449
+
+
 @ti.data_oriented
 class TaichiSim:
     """
     Lightweight Taichi sim with toy dynamics.
     Replace this with your real physics!
     """
-    def __init__(self, N=1000, L=0.5):
+    DIFFUSION = 0.5  # Noise amplitude per unit radius (was 0.1; 0.5 for dramatic effect)
+    CURL = 0.01      # Curl strength per unit radius
+    
+    def __init__(self, N=1000, L=0.5, substeps=4):
         self.N = N
         self.L = L
-        self.x = ti.Vector.field(3, dtype=ti.f32, shape=N)
+        self.substeps = substeps        # Max full RELAX steps fused into one kernel launch
+        self.inv_L = 1.0 / L            # [-L, +L] → [-1, 1] (render)
+        self.inv_2L = 1.0 / (2.0 * L)   # [-L, +L] → [0, 1] (Geogram)
+        # SoA layout: x/y/z in separate contiguous arrays (coalesced per-axis
+        # loads); x_render in main() stays AoS for GGUI
+        self.x = ti.Vector.field(3, dtype=ti.f32, shape=N, layout=ti.Layout.SOA)
         self.r = ti.field(dtype=ti.f32, shape=N)
+        self.x01 = ti.Vector.field(3, dtype=ti.f32, shape=N)  # [0,1]³ staging for Geogram
         
         # Init: jittered grid (prevents Geogram degeneracy)
         x0 = jittered_grid_positions01(N).astype(np.float32)
         self.x.from_numpy((x0 - 0.5) * (2.0 * L))   # store in [-L, +L]
         self.r.from_numpy(np.full(N, 0.02, np.float32))
         self._frozen = False
+        self.version = 1  # Bumped whenever x is written; consumers compare to skip work
 
     @ti.kernel
-    def step_kernel(self):
+    def step_kernel(self, n: ti.i32):
         """
-        Toy relax with STRONG radius-dependent dynamics.
+        n toy relax steps with STRONG radius-dependent dynamics.
         Larger radius → more aggressive spreading (visible size changes!)
+        
+        Each particle only reads its own x and r, so the n full-size steps run
+        as a serial loop inside each thread (p stays in registers): one launch
+        gives the same result as n single-step launches.
         """
+        # Named constants for readability (Python-scope scalars are compile-time
+        # constants in Taichi either way; ti.static just makes that explicit)
+        L = ti.static(self.L)
+        two_L = ti.static(2.0 * self.L)
+        inv_2L = ti.static(self.inv_2L)
+        diff_c = ti.static(self.DIFFUSION)
+        curl_c = ti.static(self.CURL)
+        
         for i in range(self.N):
             p = self.x[i]
             r = self.r[i]
             
             # STRONG radius-dependent diffusion (5x stronger than before!)
             # This makes radius changes VERY visible
-            diffusion_strength = r * 0.5  # Was 0.1, now 0.5 for dramatic effect
-            
-            # Deterministic pseudo-random based on position
-            noise = ti.Vector([
-                ti.sin(p.x * 12.9898 + p.y * 78.233),
-                ti.sin(p.y * 12.9898 + p.z * 78.233),
-                ti.sin(p.z * 12.9898 + p.x * 78.233)
-            ]) * diffusion_strength
+            diffusion_strength = r * diff_c
             
             # Radius-dependent curl (larger cells push neighbors more)
-            curl_strength = r * 0.01  # NEW: curl also scales with radius
-            curl = ti.Vector([-p.y, p.x, p.z * 0.3]) * curl_strength
-            
-            # Update position
-            p += noise + curl
+            curl_strength = r * curl_c  # NEW: curl also scales with radius
             
-            # Wrap to [-L, +L]
-            for k in ti.static(range(3)):
-                if p[k] > self.L:
-                    p[k] -= 2.0 * self.L
-                if p[k] < -self.L:
-                    p[k] += 2.0 * self.L
+            for _ in range(n):
+                # Deterministic pseudo-random based on position
+                noise = ti.Vector([
+                    hash_noise(p.x, p.y),
+                    hash_noise(p.y, p.z),
+                    hash_noise(p.z, p.x)
+                ]) * diffusion_strength
+                
+                curl = ti.Vector([-p.y, p.x, p.z * 0.3]) * curl_strength
+                
+                # Update position
+                p += noise + curl
+                
+                # Wrap to [-L, +L) (branchless, correct for any displacement size)
+                p -= two_L * ti.floor((p + L) * inv_2L)
             
             self.x[i] = p
 
+    @ti.kernel
+    def remap01_kernel(self):
+        """Map [-L, +L]³ → [0,1]³ on device into x01"""
+        for i in self.x:
+            self.x01[i] = (self.x[i] + ti.static(self.L)) * ti.static(self.inv_2L)
+
     # ========================================================================
     # REQUIRED INTERFACE (called by scheduler)
     # ========================================================================
     
     def get_positions01(self):
-        """Map [-L, +L]³ → [0,1]³ for Geogram"""
-        return ((self.x.to_numpy() + self.L) / (2.0 * self.L)).astype(np.float64)
+        """
+        Map [-L, +L]³ → [0,1]³ for Geogram.
+        Remap runs on device; one device→host copy, no host-side arithmetic.
+        Returns float32; the scheduler's owned snapshot does the one float64 upcast.
+        """
+        self.remap01_kernel()
+        return self.x01.to_numpy()
 
     def get_radii(self):
         """Get radii as numpy array"""
@@ -165,7 +234,19 @@ class TaichiSim:
     def relax_step(self):
         """One physics step"""
         if not self._frozen:
-            self.step_kernel()
+            self.step_kernel(1)
+            self.version += 1
+
+    def relax_steps(self, n):
+        """n physics steps in ceil(n / substeps) launches (queued, no host sync)"""
+        if self._frozen or n <= 0:
+            return
+        step_kernel, substeps = self.step_kernel, self.substeps
+        while n > 0:
+            m = min(n, substeps)
+            step_kernel(m)
+            n -= m
+        self.version += 1
 
     def freeze(self):
         """Pause for measurement"""
@@ -176,27 +257,35 @@ class TaichiSim:
         self._frozen = False
 
 
+# ============================================================================
+# Render Kernels (device-side, no host roundtrip)
+# ============================================================================
+
+@ti.kernel
+def scale_positions(src: ti.template(), dst: ti.template(), inv_L: ti.f32):
+    """Map sim positions [-L, +L]³ → render field [-1, 1]³ on device"""
+    for i in src:
+        dst[i] = src[i] * inv_L
+
+
 # ============================================================================
 # IQ Color Mapping
 # ============================================================================
 
-def iq_to_rgb(IQ, lo=0.70, hi=0.90):
+@ti.kernel
+def iq_to_rgb_kernel(iq: ti.template(), out: ti.template(), lo: ti.f32, hi: ti.f32):
     """
-    Map IQ to RGB colors:
+    Map IQ to RGB colors on device, writing the render color field:
     - Blue: IQ < 0.70 (low, needs growth)
     - Gray: 0.70 ≤ IQ ≤ 0.90 (good)
     - Red: IQ > 0.90 (too round, shrinking)
     """
-    c = np.zeros((len(IQ), 3), np.float32)
-    low  = IQ < lo
-    mid  = (IQ >= lo) & (IQ <= hi)
-    high = IQ > hi
-    
-    c[low]  = [0.2, 0.5, 1.0]  # Blue
-    c[mid]  = [0.7, 0.7, 0.7]  # Gray
-    c[high] = [1.0, 0.3, 0.2]  # Red
-    
-    return c
+    blue = ti.Vector([0.2, 0.5, 1.0])
+    gray = ti.Vector([0.7, 0.7, 0.7])
+    red  = ti.Vector([1.0, 0.3, 0.2])
+    for i in iq:
+        q = iq[i]
+        out[i] = ti.select(q < lo, blue, ti.select(q > hi, red, gray))
 
 
 # ============================================================================
@@ -208,7 +297,7 @@ def main(settings=None):
     Launch live IQ-driven foam viewer.
     
     Args:
-        settings: Dict with N, k_freeze, IQ_min, IQ_max, beta_grow, beta_shrink, auto_cadence
+        settings: Dict with N, k_freeze, IQ_min, IQ_max, beta_grow, beta_shrink, auto_cadence, sim_fps, max_fps
     """
     if settings is None:
         settings = load_settings()
@@ -257,6 +346,7 @@ def main(settings=None):
     # CRITICAL: Allocate Taichi fields for rendering (GGUI needs fields, not NumPy!)
     x_render = ti.Vector.field(3, dtype=ti.f32, shape=N)
     c_render = ti.Vector.field(3, dtype=ti.f32, shape=N)
+    iq_render = ti.field(dtype=ti.f32, shape=N)  # IQ staged on device for coloring
 
     # GGUI setup
     window = ti.ui.Window(f"Geogram Foam — N={N}", (1280, 720))
@@ -273,9 +363,10 @@ def main(settings=None):
     
     def update_camera(theta, phi, distance):
         """Update camera position for orbit around center"""
-        x = distance * np.sin(phi) * np.cos(theta)
-        y = distance * np.cos(phi)
-        z = distance * np.sin(phi) * np.sin(theta)
+        sin_phi = math.sin(phi)  # math.* on scalars: no ufunc dispatch
+        x = distance * sin_phi * math.cos(theta)
+        y = distance * math.cos(phi)
+        z = distance * sin_phi * math.sin(theta)
         camera.position(x, y, z)
         camera.lookat(cam_center[0], cam_center[1], cam_center[2])
         camera.fov(45)
@@ -287,19 +378,38 @@ def main(settings=None):
 
     sphere_radius = 0.04  # Larger for visibility in [-1,1] space
 
-    t0 = time.time()
+    # All loop timing uses perf_counter (monotonic, immune to wall-clock jumps)
+    clock = time.perf_counter
+    t0 = clock()
     frame = 0
     
-    # GUI update throttle (update VALUES every N frames, but always SHOW panel)
-    gui_update_interval = 10  # Update text/sliders every 10 frames
+    # GUI update throttle (update VALUES at a fixed wall-clock rate, but always SHOW panel)
+    # GGUI is immediate-mode: the panel must be submitted every frame or it vanishes
+    gui_refresh_dt = 1.0 / 15.0  # Refresh HUD values at ~15 Hz regardless of render FPS
+    last_gui_time = 0.0
+    cached_fps = 0.0
+    stats_lines = ()  # Pre-formatted [ Stats ] rows, rebuilt with the cached values
+    
+    # Per-row text cache for low-churn rows: re-format only when the value changes
+    text_cache = {}
     
-    # Pre-allocate buffers (PERFORMANCE: reuse, don't recreate)
-    colors_buf = np.full((N, 3), 0.6, dtype=np.float32)  # Reusable color buffer
+    def gui_text_cached(key, values, fmt):
+        entry = text_cache.get(key)
+        if entry is None or entry[0] != values:
+            entry = (values, fmt % values)
+            text_cache[key] = entry
+        window.GUI.text(entry[1])
     
     # Cached GUI values (updated periodically)
     cached_hud = {"IQ_mu": 0.0, "IQ_sigma": 0.0, "geom_pending": False, 
                   "cadence": 24, "t_geom_ms": 0.0, "auto_cadence": True}
     cached_pct = (0.0, 0.0, 0.0)  # (low, mid, high)
+    pct_version, pct_band = 0, None  # Inputs cached_pct was computed from
+    
+    # Render upload state (skip uploads when nothing changed)
+    c_render.fill(0.6)  # Gray until the first IQ arrives
+    last_iq_version = 0  # Scheduler starts at 0 with no IQ
+    last_x_version = 0  # Sim starts at 1, so the first frame uploads
     
     # Restart state
     restart_requested = False
@@ -308,75 +418,107 @@ def main(settings=None):
     # Pause state (toggled with SPACEBAR)
     paused = False
     
+    # Fixed-rate sim clock: RELAX steps at sim_fps, render runs up to max_fps
+    sim_fps = settings.get("sim_fps", 60)
+    max_steps_per_frame = 4  # Cap catch-up so one slow frame can't snowball
+    sim_accum = 0.0
+    prev_time = t0
+    
+    # Frame limiter: sleep out the rest of the frame instead of spinning
+    max_fps_active = settings.get("max_fps", 0)  # 0 = uncapped while running
+    max_fps_paused = 10.0
+    max_fps_idle = 5.0  # Paused and no input for idle_after_s
+    idle_after_s = 1.0
+    last_input_time = prev_time
+    
     while window.running and not restart_requested:
+        frame_start = clock()  # One clock read per frame, shared by all timers below
+        
         # Handle keyboard input
         if window.get_event(ti.ui.PRESS):
+            last_input_time = frame_start
             if window.event.key == ti.ui.SPACE:
                 paused = not paused
                 print(f"{'⏸ PAUSED' if paused else '▶ RESUMED'}")
         
         # === Camera Controls ===
         
-        # SHIFT + drag = orbit rotate
-        mouse_x, mouse_y = window.get_cursor_pos()
-        shift_held = window.is_pressed(ti.ui.SHIFT)
-        left_button = window.is_pressed(ti.ui.LMB)
+        # Inputs only accumulate into the camera state; update_camera runs once below
+        cam_dirty = False
+        
+        # Snapshot input state once (each poll crosses into the GGUI backend)
+        pressed = {k for k in CAMERA_KEYS if window.is_pressed(k)}
         
-        if shift_held and left_button:
+        # SHIFT + drag = orbit rotate (cursor/LMB only polled while SHIFT is held)
+        if window.is_pressed(ti.ui.SHIFT) and window.is_pressed(ti.ui.LMB):
+            mouse_x, mouse_y = window.get_cursor_pos()
             if last_mouse_x is not None:
                 dx = mouse_x - last_mouse_x
                 dy = mouse_y - last_mouse_y
                 
                 cam_theta -= dx * 3.0  # Horizontal rotation
-                cam_phi = np.clip(cam_phi - dy * 3.0, 0.1, np.pi - 0.1)  # Vertical
-                
-                update_camera(cam_theta, cam_phi, cam_distance)
+                cam_phi = min(max(cam_phi - dy * 3.0, 0.1), math.pi - 0.1)  # Vertical
+                cam_dirty = True
             
             last_mouse_x, last_mouse_y = mouse_x, mouse_y
         else:
             last_mouse_x, last_mouse_y = None, None
         
         # Zoom with Q/E keys (easy to reach!)
-        if window.is_pressed('q'):
-            cam_distance *= 1.02  # Zoom out
-            cam_distance = np.clip(cam_distance, 0.5, 10.0)
-            update_camera(cam_theta, cam_phi, cam_distance)
-        if window.is_pressed('e'):
-            cam_distance *= 0.98  # Zoom in
-            cam_distance = np.clip(cam_distance, 0.5, 10.0)
-            update_camera(cam_theta, cam_phi, cam_distance)
+        if 'q' in pressed:
+            cam_distance = min(max(cam_distance * 1.02, 0.5), 10.0)  # Zoom out
+            cam_dirty = True
+        if 'e' in pressed:
+            cam_distance = min(max(cam_distance * 0.98, 0.5), 10.0)  # Zoom in
+            cam_dirty = True
         
         # Pan with WASD (moves look-at center)
         pan_speed = 0.01
-        if window.is_pressed('w'):
+        if 'w' in pressed:
             cam_center[1] += pan_speed  # Pan up
-            update_camera(cam_theta, cam_phi, cam_distance)
-        if window.is_pressed('s'):
+            cam_dirty = True
+        if 's' in pressed:
             cam_center[1] -= pan_speed  # Pan down
-            update_camera(cam_theta, cam_phi, cam_distance)
-        if window.is_pressed('a'):
+            cam_dirty = True
+        if 'a' in pressed:
             cam_center[0] -= pan_speed  # Pan left
-            update_camera(cam_theta, cam_phi, cam_distance)
-        if window.is_pressed('d'):
+            cam_dirty = True
+        if 'd' in pressed:
             cam_center[0] += pan_speed  # Pan right
-            update_camera(cam_theta, cam_phi, cam_distance)
-        
-        # One scheduler step (RELAX + maybe FREEZE/ADJUST) - skip if paused
-        if not paused:
-            sched.step()
-
-        # Get positions: [-L, +L] → [-1, 1] for rendering (OPTIMIZED: no copy if not needed)
-        X_np = (sim.x.to_numpy() / sim.L).astype(np.float32)
-        x_render.from_numpy(X_np)
+            cam_dirty = True
         
-        # Get colors (OPTIMIZED: reuse buffer, update in-place)
-        IQ = sched.get_last_IQ()
-        if IQ is not None:
-            colors_buf[:] = iq_to_rgb(IQ.astype(np.float32))
+        if cam_dirty:
+            update_camera(cam_theta, cam_phi, cam_distance)
+            last_input_time = frame_start
+        elif paused and window.is_pressed(ti.ui.LMB):
+            last_input_time = frame_start  # Dragging GUI sliders while paused
+        
+        # Scheduler steps (RELAX + maybe FREEZE/ADJUST) at a fixed rate - skip if paused
+        # step_batch batches plain RELAX frames; full FSM only on measurement frames
+        now = frame_start
+        if paused:
+            sim_accum = 0.0
         else:
-            colors_buf[:] = 0.6  # Gray when no IQ yet
-        
-        c_render.from_numpy(colors_buf)
+            sim_dt = 1.0 / sim_fps
+            sim_accum = min(sim_accum + (now - prev_time), max_steps_per_frame * sim_dt)
+            n_steps = int(sim_accum / sim_dt)
+            if n_steps:
+                sched.step_batch(n_steps)
+                sim_accum -= n_steps * sim_dt
+        prev_time = now
+
+        # Get positions: [-L, +L] → [-1, 1] for rendering (device-to-device, no host copy)
+        # Skipped while paused (no steps) or frozen (relax is a no-op, version unchanged)
+        if sim.version != last_x_version:
+            scale_positions(sim.x, x_render, sim.inv_L)
+            last_x_version = sim.version
+        
+        # Get colors: only when the scheduler published a new IQ array
+        IQ = sched.get_last_IQ()
+        if sched.iq_version != last_iq_version:
+            iq_render.from_numpy(IQ)  # IQ is already float32 (controller.compute_IQ)
+            iq_to_rgb_kernel(iq_render, c_render, 0.70, 0.90)
+            last_iq_version = sched.iq_version
         
         # Render scene (camera updated above with custom orbit)
         scene.set_camera(camera)
@@ -392,22 +534,38 @@ def main(settings=None):
         canvas.scene(scene)
 
         # ===== CONTROL PANEL (ALWAYS VISIBLE, values updated periodically) =====
-        # Update cached values every N frames to reduce overhead
-        if frame % gui_update_interval == 0:
+        # Update cached values at ~15 Hz to reduce overhead
+        if now - last_gui_time >= gui_refresh_dt:
+            last_gui_time = now
             cached_hud = sched.hud()
+            cached_fps = frame / max(now - t0, 1e-6)
             
-            # Compute IQ distribution stats (OPTIMIZED: boolean masks, no np.unique)
+            # Compute IQ distribution stats (OPTIMIZED: one binning pass + bincount, no np.unique)
+            # Only when IQ or the band changed (IQ updates once per FREEZE cycle)
             if IQ is not None:
-                IQ_min_current = sched.controller.IQ_min
-                IQ_max_current = sched.controller.IQ_max
-                pct_low  = float(np.mean(IQ < IQ_min_current) * 100)
-                pct_mid  = float(np.mean((IQ >= IQ_min_current) & (IQ <= IQ_max_current)) * 100)
-                pct_high = float(np.mean(IQ > IQ_max_current) * 100)
-                cached_pct = (pct_low, pct_mid, pct_high)
+                band = (sched.controller.IQ_min, sched.controller.IQ_max)
+                if sched.iq_version != pct_version or band != pct_band:
+                    # 0 = below, 1 = within [IQ_min, IQ_max], 2 = above (same bins as controller)
+                    bins = np.array(band, dtype=IQ.dtype)
+                    bins[1] = np.nextafter(bins[1], bins.dtype.type(np.inf))  # dtype-matched inf (NumPy 1.x)
+                    counts = np.bincount(np.searchsorted(bins, IQ, side='right'), minlength=3)
+                    cached_pct = tuple((counts * (100.0 / len(IQ))).tolist())
+                    pct_version, pct_band = sched.iq_version, band
+            
+            # Format stats rows once per refresh (%-format: cheapest in CPython)
+            stats_lines = (
+                "IQ μ: %.3f" % cached_hud['IQ_mu'],
+                "IQ σ: %.3f" % cached_hud['IQ_sigma'],
+                "Below/Within/Above: %.0f%% / %.0f%% / %.0f%%" % cached_pct,
+                "",
+                "FPS: %.1f" % cached_fps,
+                "t_geom: %.1f ms" % cached_hud['t_geom_ms'],
+                "Frame: %d" % frame,
+                "Pending: %s" % cached_hud['geom_pending'],
+            )
         
         # Draw GUI EVERY frame (no flicker), using cached values
         hud = cached_hud
-        pct_low, pct_mid, pct_high = cached_pct
         
         window.GUI.begin("Control Panel", 0.01, 0.01, 0.30, 0.80)
         
@@ -434,6 +592,8 @@ def main(settings=None):
                 "IQ_max": sched.controller.IQ_max,
                 "beta_grow": sched.controller.beta_grow,
                 "beta_shrink": sched.controller.beta_shrink,
+                "sim_fps": sim_fps,
+                "max_fps": max_fps_active,
             }
             save_settings(current_settings)
         
@@ -444,6 +604,8 @@ def main(settings=None):
             sched.controller.set_iq_band(settings["IQ_min"], settings["IQ_max"])
             sched.controller.set_beta_grow(settings["beta_grow"])
             sched.controller.set_beta_shrink(settings["beta_shrink"])
+            sim_fps = settings["sim_fps"]
+            max_fps_active = settings["max_fps"]
             if settings["auto_cadence"]:
                 sched.set_k_freeze(None)
             else:
@@ -458,13 +620,15 @@ def main(settings=None):
         k_current = hud['cadence']
         
         # Show current cycle time
-        window.GUI.text(f"Frames per cycle: {k_current}")
+        gui_text_cached("cycle", (k_current,), "Frames per cycle: %d")
         
         # Calculate time in seconds (time particles have to reposition)
-        elapsed = time.time() - t0
-        fps = frame / max(elapsed, 1e-6)
-        relax_time_sec = k_current / max(fps, 1.0)
-        window.GUI.text(f"≈ {relax_time_sec:.2f} sec to relax")
+        # Cadence counts sim steps, which run at sim_fps (capped by render catch-up)
+        fps = cached_fps
+        relax_time_sec = k_current / max(min(sim_fps, fps * max_steps_per_frame), 1.0)
+        gui_text_cached("relax", (relax_time_sec,), "≈ %.2f sec to relax")
+        sim_fps = window.GUI.slider_int("Sim steps/sec", sim_fps, 10, 240)
+        max_fps_active = window.GUI.slider_int("Max FPS (0 = uncapped)", max_fps_active, 0, 240)
         window.GUI.text("")
         
         # Manual slider (only if auto is off)
@@ -515,19 +679,9 @@ def main(settings=None):
         
         # --- Stats Section ---
         window.GUI.text("[ Stats ]")
-        window.GUI.text(f"IQ μ: {hud['IQ_mu']:.3f}")
-        window.GUI.text(f"IQ σ: {hud['IQ_sigma']:.3f}")
-        window.GUI.text(f"Below/Within/Above: {pct_low:.0f}% / {pct_mid:.0f}% / {pct_high:.0f}%")
-        window.GUI.text("")
-        
-        # Performance
-        elapsed = time.time() - t0
-        fps = frame / max(elapsed, 1e-6)
-        window.GUI.text(f"FPS: {fps:.1f}")
-        window.GUI.text(f"t_geom: {hud['t_geom_ms']:.1f} ms")
-        window.GUI.text(f"Frame: {frame}")
-        window.GUI.text(f"Pending: {hud['geom_pending']}")
-        window.GUI.text(f"Status: {'⏸ PAUSED' if paused else '▶ Running'}")
+        for line in stats_lines:  # IQ stats + performance, cached above
+            window.GUI.text(line)
+        gui_text_cached("status", ('⏸ PAUSED' if paused else '▶ Running',), "Status: %s")
         
         window.GUI.text("")
         window.GUI.text("[ Controls ]")
@@ -546,10 +700,20 @@ def main(settings=None):
         
         # Print status every 500 frames (PERFORMANCE: reduce TTY back-pressure)
         if frame % 500 == 0:
-            elapsed = time.time() - t0
+            elapsed = clock() - t0
             fps = frame / elapsed
             print(f"Frame {frame}: FPS={fps:.1f}, IQ μ={hud['IQ_mu']:.3f} σ={hud['IQ_sigma']:.3f} | "
                   f"k={hud['cadence']} | t_geom={hud['t_geom_ms']:.1f}ms")
+        
+        # Frame limiter: throttle while paused/idle; optional cap while running
+        if paused:
+            idle = frame_start - last_input_time > idle_after_s
+            target_dt = 1.0 / (max_fps_idle if idle else max_fps_paused)
+        else:
+            target_dt = 1.0 / max_fps_active if max_fps_active > 0 else 0.0
+        delay = target_dt - (clock() - frame_start)
+        if delay > 0:
+            time.sleep(delay)
     
     # === After window closes ===
     # Save current settings before exit/restart
@@ -561,6 +725,8 @@ def main(settings=None):
         "IQ_max": sched.controller.IQ_max,
         "beta_grow": sched.controller.beta_grow,
         "beta_shrink": sched.controller.beta_shrink,
+        "sim_fps": sim_fps,
+        "max_fps": max_fps_active,
     }
     save_settings(final_settings)
     
@@ -4,13 +4,25 @@
 import numpy as np
 
 
+_IQ_SCALE = np.float32(36.0*np.pi)
+_S_MIN = np.float32(1e-12)
+
+
 def compute_IQ(V, S):
     """
     Compute isoperimetric quotient: IQ = 36π V² / S³
     Clamp S to avoid blow-ups
+    Float32: IQ only feeds band thresholds and colors (half the bandwidth of f64)
     """
-    S = np.maximum(S, 1e-12)
-    return (36.0*np.pi) * (V*V) / (S*S*S)
+    # In place: the f64 -> f32 casts happen inside the ufuncs, and the only
+    # allocations are IQ and the clamped S (fresh, so safe to overwrite)
+    IQ = np.multiply(V, V, dtype=np.float32)
+    IQ *= _IQ_SCALE
+    S = np.maximum(S, _S_MIN, dtype=np.float32)
+    IQ /= S
+    np.multiply(S, S, out=S)
+    IQ /= S
+    return IQ
 
 
 class IQController:
@@ -108,47 +120,61 @@ class IQController:
         IQ = compute_IQ(V, S)
         ok = (flags == 0)
 
-        low  = ok & (IQ < self.IQ_min)
-        high = ok & (IQ > self.IQ_max)
-        mid  = ok & ~(low | high)
+        # Classify in one pass: 0=low, 1=mid, 2=high, 3=degenerate
+        # (bins in IQ's dtype; nextafter keeps IQ == IQ_max in mid, and its inf must
+        # match that dtype: with a Python inf NumPy 1.x steps in f64, a no-op in f32)
+        bins = np.array((self.IQ_min, self.IQ_max), dtype=IQ.dtype)
+        bins[1] = np.nextafter(bins[1], bins.dtype.type(np.inf))
+        label = np.searchsorted(bins, IQ, side='right').astype(np.int8)
+        label[~ok] = 3
+        counts = np.bincount(label, minlength=4)
+        n_mid, n_high = counts[1], counts[2]
+        n_ok = len(label) - counts[3]
 
+        # Masked ufunc writes (where=) instead of gather/scatter fancy indexing
         dV = np.zeros_like(V)
-        dV[low]  =  self.beta_grow  * V[low]
-        if np.any(high):
-            Vbar = V[ok].mean()
-            dV[high] = -self.beta_shrink * Vbar
+        np.multiply(V, self.beta_grow, out=dV, where=(label == 0))
+        if n_high:
+            Vbar = V.mean(where=ok)
+            np.copyto(dV, -self.beta_shrink * Vbar, where=(label == 2))
 
-        # Zero-sum enforcement
-        pos = dV[dV > 0].sum()
-        neg = -dV[dV < 0].sum()
+        # Zero-sum enforcement (one mask, masked reductions: no gather/scatter copies)
+        neg_mask = dV < 0
+        pos = dV.sum(where=~neg_mask)
+        neg = -dV.sum(where=neg_mask)
 
         if pos > 0 and neg > 0:
-            dV[dV < 0] *= (pos / max(neg, 1e-12))
+            np.multiply(dV, pos / max(neg, 1e-12), out=dV, where=neg_mask)
         elif pos > 0 and neg == 0:
-            if np.any(mid):
-                dV[mid] -= pos / mid.sum()
+            if n_mid:
+                np.subtract(dV, pos / n_mid, out=dV, where=(label == 1))
             else:
-                idx = np.where(ok)[0]
-                dV[idx] -= pos / max(len(idx),1)
+                np.subtract(dV, pos / max(n_ok, 1), out=dV, where=ok)
 
         # Convert dV -> dr: V = (4/3)π r³ => dV = 4π r² dr => dr = dV / (4π r²)
-        denom = 4.0*np.pi*np.maximum(r*r, 1e-12)
-        dr = dV / denom
+        # (in place: one dr buffer + one cap buffer, no per-op temporaries)
+        dr = np.multiply(r, r)
+        np.maximum(dr, 1e-12, out=dr)
+        dr *= 4.0*np.pi
+        np.divide(dV, dr, out=dr)
         
         # SAFETY GUARD 2: Check for dominance (Bruno's edge case) or flags
         # If detected, dampen updates to prevent runaway
-        dominant = (V.max() > 0.5) or np.any(flags != 0)
+        dominant = (V.max() > 0.5) or not ok.all()
         if dominant:
             dr *= 0.25  # Strong dampening
         
         # SAFETY GUARD 3: Cap per-step change (≤1% typical)
-        dr = np.clip(dr, -self.dr_cap*r, self.dr_cap*r)
+        cap = np.multiply(r, self.dr_cap)
+        np.minimum(dr, cap, out=dr)
+        np.negative(cap, out=cap)
+        np.maximum(dr, cap, out=dr)
         
-        # Apply update
-        r_new = r + dr
+        # Apply update (reuses the dr buffer)
+        r_new = np.add(r, dr, out=dr)
         
         # SAFETY GUARD 4: Hard clamp output radii
-        r_new = np.clip(r_new, self.r_min, self.r_max)
+        np.clip(r_new, self.r_min, self.r_max, out=r_new)
         
         # SAFETY GUARD 5: Renormalize if dispersion explodes
         dispersion = r_new.std() / max(r_new.mean(), 1e-12)
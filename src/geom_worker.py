@@ -2,12 +2,16 @@
 # Non-blocking Geogram calls via worker thread
 
 import threading
-import queue
 import numpy as np
+import os
 import sys
 
-# Add geom_bridge to path
-sys.path.insert(0, '/Users/chimel/Desktop/Cursor_FoS-Custom-Grid/FoS-IQ-Taichi-Geogram/geom_bridge')
+# Add geom_bridge to path (build_geom_bridge.sh copies the .so into <repo>/geom_bridge)
+# Override with GEOM_BRIDGE_DIR; only inserted once even though both workers import it
+_BRIDGE_DIR = os.environ.get("GEOM_BRIDGE_DIR") or os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "geom_bridge"))
+if _BRIDGE_DIR not in sys.path:
+    sys.path.insert(0, _BRIDGE_DIR)
 
 from geom_bridge import compute_power_cells
 
@@ -20,25 +24,32 @@ class GeomWorker:
                        Default 512 = most stable across tests (conservative).
         """
         self.max_chunk = max_chunk
-        self.q_in  = queue.Queue(maxsize=1)
-        self.q_out = queue.Queue(maxsize=1)
+        # Chunk staging buffers (reused by the worker thread for every chunk)
+        self._pts_buf = np.empty((max_chunk, 3), dtype=np.float64)
+        self._w_buf = np.empty(max_chunk, dtype=np.float64)
+        # Single-slot handoff (one job in flight): slot + Event per direction
+        self._in_slot = None
+        self._in_ready = threading.Event()
+        self._out_slot = None
+        self._out_ready = threading.Event()
+        self._busy = False  # Job submitted and its result not yet collected
         self.th = threading.Thread(target=self._loop, daemon=True)
         self.th.start()
 
-    @staticmethod
-    def _compute_batched(pts01, w, max_chunk=512):
+    def _compute_batched(self, pts01, w):
         """
         Batch large N into chunks to avoid Geogram edge cases.
         
         Args:
             pts01: Nx3 positions in [0,1]³
             w: N weights
-            max_chunk: Max particles per call
         
         Returns:
             (V, S, FSC, flags) as numpy arrays
         """
         N = len(w)
+        max_chunk = self.max_chunk
+        cpc = compute_power_cells  # Local binding for the per-chunk calls
         
         # CRITICAL: Ensure input arrays are contiguous and owned (not views)
         # Prevents dangling pointers when C++ reads the data
@@ -48,56 +59,72 @@ class GeomWorker:
         if N <= max_chunk:
             # Single call (common path for N≤512) - arrays already contiguous
             # New binding returns tuple (V, A, FSC, flags) directly
-            V, A, FSC, flags = compute_power_cells(pts01, w)
+            V, A, FSC, flags = cpc(pts01, w)
             return (V, A, FSC, flags)
         
         # Chunked path for N>512 (batching for stability)
-        vols, areas, fscs, flags_list = [], [], [], []
+        # Results go straight into N-sized outputs (no per-chunk lists/concatenate)
+        V_out = np.empty(N, dtype=np.float64)
+        A_out = np.empty(N, dtype=np.float64)
+        FSC_out = np.empty(N, dtype=np.intc)
+        FL_out = np.empty(N, dtype=np.intc)
         for i in range(0, N, max_chunk):
             j = min(i + max_chunk, N)
+            k = j - i
             
             # CRITICAL: Make owned, contiguous copies of chunks
-            # Slices create views that can be freed while C++ is reading
-            pts_chunk = np.ascontiguousarray(pts01[i:j].copy(), dtype=np.float64)
-            w_chunk = np.ascontiguousarray(w[i:j].copy(), dtype=np.float64)
+            # Copy into reused staging buffers (owned by this worker, never views
+            # into caller memory) instead of allocating fresh copies per chunk
+            pts_chunk = self._pts_buf[:k]
+            w_chunk = self._w_buf[:k]
+            np.copyto(pts_chunk, pts01[i:j])
+            np.copyto(w_chunk, w[i:j])
             
             # New binding returns tuple directly
-            V, A, FSC, flags_chunk = compute_power_cells(pts_chunk, w_chunk)
+            V, A, FSC, flags_chunk = cpc(pts_chunk, w_chunk)
             
-            vols.append(V)
-            areas.append(A)
-            fscs.append(FSC)
-            flags_list.append(flags_chunk)
+            V_out[i:j] = V
+            A_out[i:j] = A
+            FSC_out[i:j] = FSC
+            FL_out[i:j] = flags_chunk
         
-        return (np.concatenate(vols), np.concatenate(areas),
-                np.concatenate(fscs), np.concatenate(flags_list))
+        return (V_out, A_out, FSC_out, FL_out)
 
     def _loop(self):
         import time
         while True:
-            pts01, w = self.q_in.get()
+            self._in_ready.wait()
+            pts01, w = self._in_slot
+            self._in_slot = None
+            self._in_ready.clear()
             try:
-                t0 = time.perf_counter()
-                V, S, FSC, flags = self._compute_batched(pts01, w, self.max_chunk)
-                elapsed_ms = (time.perf_counter() - t0) * 1000.0
+                t0 = time.perf_counter_ns()
+                V, S, FSC, flags = self._compute_batched(pts01, w)
+                elapsed_ms = (time.perf_counter_ns() - t0) * 1e-6  # exact int delta
                 
-                self.q_out.put((V, S, FSC, flags, elapsed_ms), block=False)
+                result = (V, S, FSC, flags, elapsed_ms)
             except Exception as e:
-                self.q_out.put(e, block=False)
+                result = e
+            # Publish slot before signalling so the reader never sees a stale value
+            self._out_slot = result
+            self._out_ready.set()
 
     def try_request(self, pts01, weights):
         """Returns True if job accepted; False if worker busy."""
-        try:
-            self.q_in.put_nowait((pts01, weights))
-            return True
-        except queue.Full:
+        if self._busy:
             return False
+        self._busy = True
+        self._in_slot = (pts01, weights)
+        self._in_ready.set()
+        return True
 
     def try_result(self):
-        try:
-            v = self.q_out.get_nowait()
-            if isinstance(v, Exception): raise v
-            return v
-        except queue.Empty:
+        if not self._out_ready.is_set():
             return None
+        v = self._out_slot
+        self._out_slot = None
+        self._out_ready.clear()
+        self._busy = False
+        if isinstance(v, Exception): raise v
+        return v
 
@@ -3,10 +3,15 @@
 
 import time
 import numpy as np
+import os
 import sys
 
-# Add geom_bridge to path
-sys.path.insert(0, '/Users/chimel/Desktop/Cursor_FoS-Custom-Grid/FoS-IQ-Taichi-Geogram/geom_bridge')
+# Add geom_bridge to path (build_geom_bridge.sh copies the .so into <repo>/geom_bridge)
+# Override with GEOM_BRIDGE_DIR; only inserted once even though both workers import it
+_BRIDGE_DIR = os.environ.get("GEOM_BRIDGE_DIR") or os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "geom_bridge"))
+if _BRIDGE_DIR not in sys.path:
+    sys.path.insert(0, _BRIDGE_DIR)
 
 from geom_bridge import compute_power_cells
 
@@ -18,13 +23,17 @@ class GeomWorkerSync:
     """
     def __init__(self, max_chunk=512):
         self.max_chunk = max_chunk
+        # Chunk staging buffers (reused for every chunk)
+        self._pts_buf = np.empty((max_chunk, 3), dtype=np.float64)
+        self._w_buf = np.empty(max_chunk, dtype=np.float64)
         self.pending = False
         self.last_result = None
 
-    @staticmethod
-    def _compute_batched(pts01, w, max_chunk=512):
+    def _compute_batched(self, pts01, w):
         """Same batching logic as threaded version"""
         N = len(w)
+        max_chunk = self.max_chunk
+        cpc = compute_power_cells  # Local binding for the per-chunk calls
         
         # CRITICAL: Ensure input arrays are contiguous and owned (not views)
         # Prevents dangling pointers when C++ reads the data
@@ -34,29 +43,36 @@ class GeomWorkerSync:
         if N <= max_chunk:
             # Single call - arrays already contiguous from above
             # New binding returns tuple (V, A, FSC, flags) directly
-            V, A, FSC, flags = compute_power_cells(pts01, w)
+            V, A, FSC, flags = cpc(pts01, w)
             return (V, A, FSC, flags)
         
         # Chunked path
-        vols, areas, fscs, flags_list = [], [], [], []
+        # Results go straight into N-sized outputs (no per-chunk lists/concatenate)
+        V_out = np.empty(N, dtype=np.float64)
+        A_out = np.empty(N, dtype=np.float64)
+        FSC_out = np.empty(N, dtype=np.intc)
+        FL_out = np.empty(N, dtype=np.intc)
         for i in range(0, N, max_chunk):
             j = min(i + max_chunk, N)
+            k = j - i
             
             # CRITICAL: Make owned, contiguous copies of chunks
-            # Slices create views that can be freed while C++ is reading
-            pts_chunk = np.ascontiguousarray(pts01[i:j].copy(), dtype=np.float64)
-            w_chunk = np.ascontiguousarray(w[i:j].copy(), dtype=np.float64)
+            # Copy into reused staging buffers (owned by this worker, never views
+            # into caller memory) instead of allocating fresh copies per chunk
+            pts_chunk = self._pts_buf[:k]
+            w_chunk = self._w_buf[:k]
+            np.copyto(pts_chunk, pts01[i:j])
+            np.copyto(w_chunk, w[i:j])
             
             # New binding returns tuple directly
-            V, A, FSC, flags_chunk = compute_power_cells(pts_chunk, w_chunk)
+            V, A, FSC, flags_chunk = cpc(pts_chunk, w_chunk)
             
-            vols.append(V)
-            areas.append(A)
-            fscs.append(FSC)
-            flags_list.append(flags_chunk)
+            V_out[i:j] = V
+            A_out[i:j] = A
+            FSC_out[i:j] = FSC
+            FL_out[i:j] = flags_chunk
         
-        return (np.concatenate(vols), np.concatenate(areas),
-                np.concatenate(fscs), np.concatenate(flags_list))
+        return (V_out, A_out, FSC_out, FL_out)
 
     def try_request(self, pts01, weights):
         """
@@ -67,9 +83,9 @@ class GeomWorkerSync:
             return False  # Don't pile up work
         
         try:
-            t0 = time.perf_counter()
-            V, S, FSC, flags = self._compute_batched(pts01, weights, self.max_chunk)
-            elapsed_ms = (time.perf_counter() - t0) * 1000.0
+            t0 = time.perf_counter_ns()
+            V, S, FSC, flags = self._compute_batched(pts01, weights)
+            elapsed_ms = (time.perf_counter_ns() - t0) * 1e-6  # exact int delta
             
             self.last_result = (V, S, FSC, flags, elapsed_ms)
             self.pending = True
@@ -6,6 +6,21 @@ import numpy as np
 from geom_worker_sync import GeomWorkerSync as GeomWorker  # Single-threaded test
 from controller import IQController
 
+# Auto cadence at t_geom == target_ms. Fixed, not taken from k_freeze: the viewer
+# persists the auto-tuned k as k_freeze, which would compound across sessions
+_K_REF = 24
+
+
+def _mean_std(x):
+    """
+    Mean and std of a 1-D array from one sum + one dot (f64 accumulation),
+    instead of separate mean() and std() passes.
+    """
+    n = x.shape[0]
+    mu = x.sum(dtype=np.float64) / n
+    ex2 = np.einsum('i,i->', x, x, dtype=np.float64) / n
+    return float(mu), float(np.sqrt(max(ex2 - mu*mu, 0.0)))
+
 
 class FoamScheduler:
     def __init__(self, taichi_sim, k_freeze=24, target_ms=12.0):
@@ -36,13 +51,39 @@ class FoamScheduler:
         
         # Metrics
         self.last_IQ = None
+        self.iq_version = 0  # Bumped each time last_IQ is replaced
         self.last_IQ_stats = (0.0, 0.0)
+        self.IQ_mu = 0.0     # Plain-attribute mirrors of last_IQ_stats, for hot
+        self.IQ_sigma = 0.0  # loops that shouldn't build a hud() dict per frame
         self.last_t_geom_ms = 0.0
+        self._t_ema = None  # Smoothed t_geom driving adaptive cadence
+        self._k_floor = min(16, k_freeze)  # Auto cadence never pushes a low k_freeze up
         self.results_seen = 0
         self.recycle_every = 300
+        self._recycle_countdown = self.recycle_every  # Results left before worker recycle
         
         # Debug canary (optional)
         self._debug_call_count = 0
+        self._paranoid = False  # True = full per-element snapshot invariant scans
+        
+        # Snapshot scratch buffers (sized to N on first snapshot). Reusing them is
+        # safe: strict one-in-flight means the previous request is finished with them
+        self._P_scratch = None
+        self._r_scratch = None
+        self._W_scratch = None
+
+    @staticmethod
+    def _sanitize(P, r, wrap=True):
+        """
+        In-place sanitize: wrap P into [0,1), clip r to [1e-6, 1].
+        mod already yields >= 0, so only the upper edge needs clipping
+        (guards mod rounding tiny negatives up to exactly 1.0).
+        wrap=False skips the mod for sims whose positions are already in [0,1].
+        """
+        if wrap:
+            np.mod(P, 1.0, out=P)
+        np.minimum(P, 1.0 - 1e-9, out=P)
+        np.clip(r, 1e-6, 1.0, out=r)
 
     def _snapshot_inputs(self):
         """
@@ -60,25 +101,32 @@ class FoamScheduler:
         
         # Owned, contiguous copies (NO views into sim memory)
         # This is the same pattern as test_min_loop.py which passed 200 calls
-        P_own = np.ascontiguousarray(P, dtype=np.float64)
-        r_own = np.ascontiguousarray(r, dtype=np.float64)
-        
-        # Sanitize (wrap, clip, de-duplicate)
-        P_own = np.mod(P_own, 1.0)
-        P_own = np.clip(P_own, 0.0, 1.0 - 1e-9)
-        r_own = np.clip(r_own, 1e-6, 1.0)
+        # Copied into scheduler-owned C-order scratch (never the sim's own buffer,
+        # which the in-place sanitize below must never touch)
+        if self._P_scratch is None or self._P_scratch.shape[0] != N:
+            self._P_scratch = np.empty((N, 3), dtype=np.float64)
+            self._r_scratch = np.empty(N, dtype=np.float64)
+            self._W_scratch = np.empty(N, dtype=np.float64)
+        P_own = self._P_scratch
+        r_own = self._r_scratch
+        np.copyto(P_own, P)
+        np.copyto(r_own, r)
         
-        # Ensure final contiguity after sanitization
-        P_own = np.ascontiguousarray(P_own, dtype=np.float64)
-        r_own = np.ascontiguousarray(r_own, dtype=np.float64)
+        # Sanitize (wrap, clip) in place on the owned copies
+        # Sims that keep positions wrapped to [0,1] advertise positions_clean
+        self._sanitize(P_own, r_own, wrap=not getattr(self.sim, 'positions_clean', False))
         
-        # Cheap invariants
-        assert P_own.flags['C_CONTIGUOUS'], "P not C-contiguous"
-        assert r_own.flags['C_CONTIGUOUS'], "r not C-contiguous"
-        assert np.isfinite(P_own).all(), "P has non-finite values"
-        assert np.isfinite(r_own).all(), "r has non-finite values"
+        # Cheap invariants: NaN/inf survive mod/clip, so one sum per array catches
+        # them without a bool temp; full per-element scans only when _paranoid
+        if self._paranoid:
+            assert P_own.flags['C_CONTIGUOUS'], "P not C-contiguous"
+            assert r_own.flags['C_CONTIGUOUS'], "r not C-contiguous"
+            assert np.isfinite(P_own).all(), "P has non-finite values"
+            assert np.isfinite(r_own).all(), "r has non-finite values"
+        else:
+            assert np.isfinite(P_own.sum() + r_own.sum()), "P/r has non-finite values"
         
-        W_own = r_own * r_own  # weights = r²
+        W_own = np.multiply(r_own, r_own, out=self._W_scratch)  # weights = r²
         
         return P_own, W_own, N
 
@@ -93,22 +141,25 @@ class FoamScheduler:
         # RELAX always (unless frozen by sim itself)
         self.sim.relax_step()
 
-        # PRIORITY 1: If a request is pending, try to collect and RETURN EARLY
+        # PRIORITY 1: If a request is pending, collect it (one request in flight).
+        # GeomWorkerSync already computed it inside try_request on the submit frame,
+        # so that frame blocked for t_geom; this frame only picks up the result
         if self.worker_pending:
             res = self.worker.try_result()
             if res is None:
-                # Still computing - do NOT issue new request
+                # Still computing (threaded GeomWorker only) - do NOT issue new request
                 return
             
             # Result ready - unpack and apply
             V, A, FSC, FL, t_ms = res
             
-            # Cheap sanity check
-            if not np.isfinite(V).all():
+            # Cheap sanity check, one pass over V: any NaN/inf makes the sum
+            # non-finite (volumes are bounded by the unit cube, so no overflow)
+            sumV = float(V.sum())
+            if not np.isfinite(sumV):
                 raise RuntimeError(f"Non-finite volumes at frame {self.frame}")
             
             # Optional: check volume sum (should be ~1.0 for periodic unit cube)
-            sumV = float(V.sum())
             if abs(sumV - 1.0) > 1e-2:
                 # Not fatal, but log it
                 pass
@@ -120,26 +171,31 @@ class FoamScheduler:
             
             # Update metrics
             self.last_IQ = IQ
-            self.last_IQ_stats = (float(IQ.mean()), float(IQ.std()))
+            self.iq_version += 1
+            self.last_IQ_stats = self.IQ_mu, self.IQ_sigma = _mean_std(IQ)
             self.last_t_geom_ms = float(t_ms)
             
             # Adaptive cadence (only if not manually overridden)
+            # Proportional on an EMA of t_geom: k = _K_REF * t_ema / target_ms keeps the
+            # amortized geometry cost per frame (t/k) constant, and settles smoothly
+            # instead of stepping +8/-4 inside a hysteresis band
+            self._t_ema = t_ms if self._t_ema is None else 0.8*self._t_ema + 0.2*t_ms
             if self.k_manual is None:
-                if t_ms > 32 and self.k < 96:
-                    self.k += 8
-                elif t_ms < 12 and self.k > 16:
-                    self.k -= 4
+                k = round(_K_REF * self._t_ema / self.target_ms)
+                self.k = max(self._k_floor, min(k, 96))
             
             # FSM: mark idle
             self.worker_pending = False
             self.results_seen += 1
             
             # Optional: recycle worker
-            if self.results_seen % self.recycle_every == 0:
+            self._recycle_countdown -= 1
+            if self._recycle_countdown == 0:
                 self.worker = GeomWorker()
+                self._recycle_countdown = self.recycle_every
             
-            # RETURN - do not issue new request this frame
-            return
+            # Fall through: the countdown was reset at submit, so this frame
+            # just ticks it like a plain RELAX frame (no back-to-back request)
 
         # PRIORITY 2: Count down to next geometry call
         self._geom_countdown -= 1
@@ -153,10 +209,11 @@ class FoamScheduler:
         self.sim.resume()
         
         # Optional debug canary (cheap hash of first 4K bytes)
+        # Slice a byte view before copying: only 4K is materialized, not all of P
         self._debug_call_count += 1
         if self._debug_call_count % 50 == 0:
-            hashP = hash(P_own.tobytes()[:4096])
-            hashW = hash(W_own.tobytes()[:4096])
+            hashP = hash(memoryview(P_own).cast('B')[:4096].tobytes())
+            hashW = hash(memoryview(W_own).cast('B')[:4096].tobytes())
             # Uncomment to debug: print(f"[geom #{self._debug_call_count}] hashP={hashP} hashW={hashW}")
         
         # Submit request
@@ -165,6 +222,38 @@ class FoamScheduler:
             self.worker_pending = True
             self._geom_countdown = self.k  # Reset cadence
 
+    def is_measurement_frame(self):
+        """
+        True if the next step() does more than RELAX: a pending result must be
+        polled (and, once ready, applied), or the cadence countdown expires and
+        a snapshot is submitted.
+        """
+        return self.worker_pending or self._geom_countdown <= 1
+
+    def step_batch(self, n):
+        """
+        Run n scheduler steps. Stretches of plain RELAX frames between
+        measurement frames go to the sim as one relax_steps() call (optional
+        in the sim interface; falls back to relax_step() per frame);
+        step() only runs where the FSM has work to do.
+        """
+        relax_steps = getattr(self.sim, 'relax_steps', None)
+        while n > 0:
+            if self.is_measurement_frame():
+                self.step()
+                n -= 1
+                continue
+            # Stop short of the submit frame (countdown >= 2 here, so run >= 1)
+            run = min(n, self._geom_countdown - 1)
+            self.frame += run
+            self._geom_countdown -= run
+            if relax_steps is not None:
+                relax_steps(run)
+            else:
+                for _ in range(run):
+                    self.sim.relax_step()
+            n -= run
+
     def set_k_freeze(self, k: int | None):
         """
         Set cadence manually or re-enable auto tuning.
@@ -182,11 +271,13 @@ class FoamScheduler:
             self.k = k
     
     def hud(self):
-        """Return HUD metrics dictionary"""
-        mu, sigma = self.last_IQ_stats
+        """
+        Return HUD metrics dictionary (builds a new dict: for per-frame checks
+        read IQ_mu / IQ_sigma / k / results_seen directly)
+        """
         return {
-            "IQ_mu": mu,
-            "IQ_sigma": sigma,
+            "IQ_mu": self.IQ_mu,
+            "IQ_sigma": self.IQ_sigma,
             "geom_pending": self.worker_pending,
             "cadence": self.k,
             "t_geom_ms": self.last_t_geom_ms,
@@ -1,29 +1,38 @@
 # sim_stub.py
-# HARDENED: Guaranteed C-order, owned buffers in getters
+# HARDENED: Guaranteed C-order getters (positions: read-only view; radii: owned f64 copy)
 
 import numpy as np
 
 
 def jittered_grid_positions01(n, seed=42):
     """Generate jittered grid positions (avoids random overlaps that crash Geogram)"""
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     m = int(round(n ** (1/3)))
     m = max(4, m)
+    n_grid = m ** 3
     gx = np.linspace(0.05, 0.95, m)
-    pts = np.stack(np.meshgrid(gx, gx, gx, indexing='ij'), axis=-1).reshape(-1,3)
-    if len(pts) < n:
-        k = n - len(pts)
-        jitter = (np.random.rand(k,3) - 0.5) * (1.0/m) * 0.2
-        pts = np.concatenate([pts, pts[:k] + jitter], axis=0)
-    pts = pts[:n]
-    pts += (np.random.rand(n,3) - 0.5) * (1.0/m) * 0.1
-    return np.mod(pts, 1.0)
+    # Grid broadcast straight into one buffer (same scheme as run_geogram_foam.py)
+    buf = np.empty((max(n, n_grid), 3), np.float64)
+    grid = buf[:n_grid].reshape(m, m, m, 3)
+    grid[..., 0] = gx[:, None, None]
+    grid[..., 1] = gx[None, :, None]
+    grid[..., 2] = gx[None, None, :]
+    pts = buf[:n]
+    if n_grid < n:
+        k = n - n_grid
+        h = 0.5 * (1.0/m) * 0.2
+        pts[n_grid:] = pts[:k]
+        pts[n_grid:] += rng.uniform(-h, h, (k, 3))
+    h = 0.5 * (1.0/m) * 0.1
+    pts += rng.uniform(-h, h, (n, 3))
+    # No wrap needed: grid spans [0.05, 0.95] and total jitter is ≤ 0.15/m ≤ 0.0375
+    return pts
 
 
 class TaichiSimStub:
     """
-    HARDENED stub: Always returns owned, C-contiguous arrays.
-    NO .ravel() views, NO aliasing.
+    HARDENED stub: Always returns C-contiguous arrays (read-only views or owned copies).
+    NO .ravel() views; callers cannot write through to sim state.
     """
     
     def __init__(self, N=100, box_size=1.0):
@@ -36,38 +45,55 @@ class TaichiSimStub:
         """
         self.N = N
         self.box_size = box_size
+        # Independent child streams (two generators seeded 42 would correlate)
+        grid_seed, state_seed = np.random.SeedSequence(42).spawn(2)
+        self._rng = np.random.default_rng(state_seed)  # Radii init + RELAX noise
+        
+        # State is float32 (like TaichiSim); widened to float64 only at the
+        # scheduler's snapshot copy (positions) and in get_radii (controller)
         
         # Initialize positions with jittered grid (SAFE - avoids Geogram degeneracies)
-        self.positions = jittered_grid_positions01(N, seed=42)
+        self.positions = jittered_grid_positions01(N, seed=grid_seed).astype(np.float32)
         
         # Initialize radii (typical foam: mean spacing ~ 0.02-0.03)
         mean_r = 0.02
-        self.radii = mean_r + 0.01 * np.random.randn(N)
-        self.radii = np.clip(self.radii, 0.01, 0.05)  # clamp to reasonable range
+        self.radii = self._rng.standard_normal(N, dtype=np.float32)
+        self.radii *= 0.01
+        self.radii += mean_r
+        np.clip(self.radii, 0.01, 0.05, out=self.radii)  # clamp to reasonable range
         
         # Velocities (for RELAX step)
-        self.velocities = np.zeros((N, 3))
+        self.velocities = np.zeros((N, 3), dtype=np.float32)
         
         self.frozen = False
         self.relax_step_count = 0
         
+        # Positions stay in [0,1] when the box is the unit cube (grid init + per-step mod),
+        # so the scheduler can skip its wrap pass
+        self.positions_clean = (box_size == 1.0)
+        
+        # RELAX noise: reused buffer (no per-step allocation)
+        self._noise = np.empty((N, 3), dtype=np.float32)
+        
         print(f"✓ TaichiSimStub initialized: N={N}, box_size={box_size}")
     
     def get_positions01(self):
         """
         Return positions in [0,1]³ coordinate system.
-        GUARANTEED: (N, 3) C-contiguous float64, OWNED (not a view).
+        GUARANTEED: (N, 3) C-contiguous float32, READ-ONLY view (zero-copy).
         """
-        # Ensure C-order, owned buffer - NO views
-        return np.ascontiguousarray(self.positions, dtype=np.float64)
+        # FoamScheduler._snapshot_inputs makes the owned float64 copy; no copy here
+        P = self.positions.view()
+        P.flags.writeable = False
+        return P
     
     def get_radii(self):
         """
         Return radii array.
-        GUARANTEED: (N,) C-contiguous float64, OWNED (not a view).
+        GUARANTEED: (N,) C-contiguous float64, OWNED (widened from float32 storage).
         """
-        # Ensure C-order, owned buffer - NO views
-        return np.ascontiguousarray(self.radii, dtype=np.float64)
+        # Controller math stays float64 (same as TaichiSim.get_radii)
+        return self.radii.astype(np.float64)
     
     def set_radii(self, r_new):
         """Update radii from controller"""
@@ -76,17 +102,34 @@ class TaichiSimStub:
     def relax_step(self):
         """
         Single RELAX step (placeholder).
-        Real implementation: Taichi GPU forces + PBD
+        Real implementation: Taichi GPU forces + PBD (the on-device version of
+        this walk is TaichiSim.step_kernel in run_geogram_foam.py; this stub
+        stays NumPy-only so the scheduler can run without Taichi)
         """
         if self.frozen:
             return  # no movement during FREEZE
         
-        # Placeholder: random walk + periodic wrap
-        self.positions += 0.001 * np.random.randn(self.N, 3)
-        self.positions = self.positions % self.box_size
+        # Placeholder: random walk + periodic wrap (in place)
+        self._rng.standard_normal(dtype=np.float32, out=self._noise)
+        self._noise *= 0.001  # scale in place: no 0.001*noise temporary
+        self.positions += self._noise
+        np.mod(self.positions, self.box_size, out=self.positions)
         
         self.relax_step_count += 1
     
+    def relax_steps(self, n):
+        """n RELAX steps in one call (same walk as relax_step, attributes bound once)"""
+        if self.frozen:
+            return
+        P, noise, normal = self.positions, self._noise, self._rng.standard_normal
+        box, f32 = self.box_size, np.float32
+        for _ in range(n):
+            normal(dtype=f32, out=noise)
+            noise *= 0.001
+            P += noise
+            np.mod(P, box, out=P)
+        self.relax_step_count += n
+    
     def freeze(self):
         """Pause particle advection for FREEZE snapshot"""
         self.frozen = True